@@ -10,3 +10,6 @@ accounts = [
 
 tick = '1dragon'
 amount = '100000000'
+concurrency = 50
+max_retries = 10
+rpc_batch = False
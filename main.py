@@ -1,50 +1,99 @@
 import asyncio
+import json
+import random
 
 from loguru import logger
 
 import config
 from sdk.py_near.account import Account
 from sdk.py_near.dapps.core import NEAR
+from sdk.py_near.exceptions.provider import InvalidAccount, UnknownAccount, UnknownAccessKeyError
 from utils.add_logger import add_logger
 
+MIN_BALANCE = 3 * NEAR // 10
 
-async def send_transaction(account: dict):
-    while True:
-        try:
-            acc = Account(account_id=account["account_id"], private_key=account["private_key"])
-            await acc.startup()
-            balance_int = await acc.get_balance()
-            balance_float = round(balance_int / NEAR, 4)
-
-            if balance_float > 0.3:
-                tr = await acc.function_call(
-                    contract_id="inscription.near",
-                    method_name="inscribe",
-                    args={
-                        "p": "nrc-20",
-                        "op": "mint",
-                        "tick": config.tick,
-                        "amt": config.amount
-                    },
-                    nowait=True
-                )
-                logger.success(
-                    f'{account["account_id"]}: {balance_float} $NEAR, hash: https://nearblocks.io/txns/{tr}')
-
-                new_balance_int = await acc.get_balance()
-                while new_balance_int == balance_int:
-                    new_balance_int = await acc.get_balance()
-                    await asyncio.sleep(1)
-
-            else:
-                logger.warning(f'low balance: {balance_float} $NEAR.')
+MINT_ARGS = json.dumps(
+    {
+        "p": "nrc-20",
+        "op": "mint",
+        "tick": config.tick,
+        "amt": config.amount
+    }
+).encode("utf8")
+
+
+def format_near(amount: int) -> str:
+    return f'{amount // NEAR}.{amount % NEAR // (NEAR // 10_000):04d}'
+
+
+async def send_transaction(account: dict, semaphore: asyncio.Semaphore):
+    acc = Account(
+        account_id=account["account_id"],
+        private_key=account["private_key"],
+        allow_batch=config.rpc_batch
+    )
+    started = False
+    retries = 0
+    try:
+        while True:
+            failed = False
+            try:
+                async with semaphore:
+                    if not started:
+                        await acc.startup()
+                        started = True
+
+                    balance_int = await acc.get_balance()
+                    balance = format_near(balance_int)
+
+                    if balance_int > MIN_BALANCE:
+                        tr = await acc.function_call(
+                            contract_id="inscription.near",
+                            method_name="inscribe",
+                            args=MINT_ARGS,
+                            nowait=False
+                        )
+                        try:
+                            tx_hash = tr.transaction.hash
+                            failure = tr.status.get("Failure")
+                        except Exception as e:
+                            # the transaction is already sent, only reading its result failed
+                            logger.exception(e)
+                            tx_hash, failure = 'unknown', None
+
+                        if failure:
+                            failed = True
+                            logger.warning(
+                                f'{account["account_id"]}: mint failed: {failure}, '
+                                f'hash: https://nearblocks.io/txns/{tx_hash}')
+                        else:
+                            logger.success(
+                                f'{account["account_id"]}: {balance} $NEAR, '
+                                f'hash: https://nearblocks.io/txns/{tx_hash}')
+                            retries = 0
+                    else:
+                        logger.warning(f'low balance: {balance} $NEAR.')
+                        break
+            except (InvalidAccount, UnknownAccount, UnknownAccessKeyError) as e:
+                logger.error(f'{account["account_id"]}: {e.__class__.__name__}, stop.')
                 break
-        except Exception as e:
-            logger.exception(e)
+            except Exception as e:
+                logger.exception(e)
+                failed = True
+
+            if failed:
+                retries += 1
+                if retries >= config.max_retries:
+                    logger.error(f'{account["account_id"]}: {retries} failed attempts in a row, stop.')
+                    break
+                await asyncio.sleep(5 + random.random() * 5)
+    finally:
+        await acc.shutdown()
 
 
 async def main(accounts: [dict]):
-    tasks = [asyncio.create_task(send_transaction(acc)) for acc in accounts]
+    semaphore = asyncio.Semaphore(config.concurrency)
+    tasks = [asyncio.create_task(send_transaction(acc, semaphore)) for acc in accounts]
     await asyncio.gather(*tasks)
 
 
@@ -49,8 +49,9 @@ class Account(object):
         account_id: str = None,
         private_key: Union[List[Union[str, bytes]], str, bytes] = None,
         rpc_addr="https://rpc.mainnet.near.org",
+        allow_batch: bool = False,
     ):
-        self._provider = JsonProvider(rpc_addr)
+        self._provider = JsonProvider(rpc_addr, allow_batch=allow_batch)
         self.account_id = account_id
         if private_key is None:
             private_keys = []
@@ -88,21 +89,36 @@ class Account(object):
         # status = await self._provider.get_status()
         self.chain_id = 'mainnet'
 
-    async def _update_last_block_hash(self):
+    async def shutdown(self):
         """
-        Update last block hash& If it's older than 50 block before, transaction will fail
-        :return: last block hash
+        Release network resources held by the provider
+        :return:
         """
-        if self._latest_block_hash_ts + 50 > utils.timestamp():
-            return
-        self._latest_block_hash = (await self._provider.get_status())["sync_info"][
-            "latest_block_hash"
-        ]
-        self._latest_block_height = (await self._provider.get_status())["sync_info"][
-            "latest_block_height"
-        ]
+        await self._provider.close()
+
+    def _set_latest_block(self, sync_info: dict):
+        self._latest_block_hash = sync_info["latest_block_hash"]
+        self._latest_block_height = sync_info["latest_block_height"]
         self._latest_block_hash_ts = utils.timestamp()
 
+    async def _get_access_key_and_block_hash(self, pk: bytes) -> AccountAccessKey:
+        """
+        Get access key and update last block hash if needed. When both are required
+        they are fetched in one batch
+        :return: AccountAccessKey
+        """
+        if self._latest_block_hash_ts + 50 > utils.timestamp():
+            return await self.get_access_key(pk)
+
+        resp, status = await self._provider.get_access_key_and_status(
+            self.account_id, self._public_key(pk)
+        )
+        if status["sync_info"]["syncing"]:
+            # batch went to a syncing node, take the block hash from a synced one
+            status = await self._provider.get_status()
+        self._set_latest_block(status["sync_info"])
+        return self._build_access_key(resp)
+
     async def sign_and_submit_tx(
         self, receiver_id, actions: List[Action], nowait=False
     ) -> Union[TransactionResult, str]:
@@ -117,8 +133,7 @@ class Account(object):
         if not self._signers:
             raise ValueError("You must provide a private key or seed to call methods")
         pk = await self._free_signers.get()
-        access_key = await self.get_access_key(pk)
-        await self._update_last_block_hash()
+        access_key = await self._get_access_key_and_block_hash(pk)
 
         block_hash = base58.b58decode(self._latest_block_hash.encode("utf8"))
         trx_hash = transactions.calc_trx_hash(
@@ -140,9 +155,14 @@ class Account(object):
 
         try:
             if nowait:
-                return await self._provider.send_tx(serialized_tx)
+                return await self._provider.send_tx(
+                    serialized_tx, signer_id=self.account_id
+                )
             result = await self._provider.send_tx_and_wait(
-                serialized_tx, trx_hash=trx_hash, receiver_id=receiver_id
+                serialized_tx,
+                trx_hash=trx_hash,
+                receiver_id=receiver_id,
+                signer_id=self.account_id,
             )
             if isinstance(result, TransactionResult):
                 return result
@@ -177,12 +197,18 @@ class Account(object):
         if pk is None:
             pk = self._signers[0]
 
-        private_key = ed25519.SigningKey(pk)
-        public_key = private_key.get_verifying_key()
-
         resp = await self._provider.get_access_key(
-            self.account_id, base58.b58encode(public_key.to_bytes()).decode("utf8")
+            self.account_id, self._public_key(pk)
         )
+        return self._build_access_key(resp)
+
+    @staticmethod
+    def _public_key(pk: bytes) -> str:
+        public_key = ed25519.SigningKey(pk).get_verifying_key()
+        return base58.b58encode(public_key.to_bytes()).decode("utf8")
+
+    @staticmethod
+    def _build_access_key(resp: dict) -> AccountAccessKey:
         if "error" in resp:
             raise ValueError(resp["error"])
         return AccountAccessKey(**resp)
@@ -224,7 +250,7 @@ class Account(object):
         self,
         contract_id: str,
         method_name: str,
-        args: dict,
+        args: Union[dict, bytes],
         gas: int = constants.DEFAULT_ATTACHED_GAS,
         amount: int = 0,
         nowait: bool = False,
@@ -233,13 +259,16 @@ class Account(object):
         Call function on smart contract
         :param contract_id: smart contract address
         :param method_name: call method name
-        :param args: json params for method
+        :param args: json params for method, or already serialized json bytes
         :param gas: amount of attachment gas. Default is 200000000000000
         :param amount: amount of attachment NEAR, Default is 0
         :param nowait: if nowait is True, return transaction hash, else wait execution
         :return: transaction hash or TransactionResult
         """
-        ser_args = json.dumps(args).encode("utf8")
+        if isinstance(args, bytes):
+            ser_args = args
+        else:
+            ser_args = json.dumps(args).encode("utf8")
         return await self.sign_and_submit_tx(
             contract_id,
             [
@@ -404,8 +433,7 @@ class Account(object):
             pk = self._signers[0]
         else:
             pk = self._signer_by_pk[public_key]
-        access_key = await self.get_access_key(pk)
-        await self._update_last_block_hash()
+        access_key = await self._get_access_key_and_block_hash(pk)
 
         private_key = ed25519.SigningKey(pk)
         verifying_key = private_key.get_verifying_key()
@@ -1,4 +1,11 @@
 TIMEOUT_WAIT_RPC = 1200
+RPC_CONNECT_TIMEOUT = 3
+RPC_STATUS_TIMEOUT = 10
+ACCOUNT_CACHE_TTL = 0.5
+RPC_CHECK_INTERVAL = 30
+BLOCK_TIME = 1.2
+TX_POLL_MIN_DELAY = 0.3
+TX_POLL_MAX_DELAY = 10
 TGAS = 1_000_000_000_000
 
 DEFAULT_ATTACHED_GAS = 31 * TGAS
@@ -223,7 +223,7 @@ class ActionError(TxExecutionError):
         if isinstance(data, str):
             data = json.loads(data)
         self.index = data.get("index", None)
-        key, value = list(data["kind"].items())[0]
+        key, value = next(iter(data["kind"].items()))
         self.kind = _ACTION_ERROR_KINDS[key](value)
 
 
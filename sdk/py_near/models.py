@@ -1,5 +1,4 @@
 import base64
-import json
 from dataclasses import dataclass, field
 from enum import Enum
 from json import JSONDecodeError
@@ -20,6 +19,7 @@ from py_near_primitives import (
 )
 
 from sdk.py_near.exceptions.exceptions import parse_error
+from sdk.py_near.utils import json_loads
 
 Action = Union[
     DelegateAction,
@@ -36,6 +36,16 @@ Action = Union[
 
 
 class ReceiptOutcome:
+    __slots__ = (
+        "logs",
+        "metadata",
+        "receipt_ids",
+        "status",
+        "tokens_burnt",
+        "executor_id",
+        "gas_burnt",
+    )
+
     logs: List[str]
     metadata: dict
     receipt_ids: List[str]
@@ -55,9 +65,9 @@ class ReceiptOutcome:
     @property
     def error(self):
         if "Failure" in self.status:
-            error_type, args = list(
-                self.status["Failure"]["ActionError"]["kind"].items()
-            )[0]
+            error_type, args = next(
+                iter(self.status["Failure"]["ActionError"]["kind"].items())
+            )
             return parse_error(error_type, args)
 
 
@@ -78,7 +88,7 @@ class PublicKeyPermissionType(str, Enum):
     FUNCTION_CALL = "FunctionCall"
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessKey:
     permission_type: PublicKeyPermissionType
     nonce: int
@@ -93,7 +103,7 @@ class AccessKey:
                 nonce=data["nonce"], permission_type=PublicKeyPermissionType.FULL_ACCESS
             )
 
-        permission_type, permission_data = list(data["permission"].items())[0]
+        permission_type, permission_data = next(iter(data["permission"].items()))
         return cls(
             nonce=data["nonce"],
             permission_type=PublicKeyPermissionType.FUNCTION_CALL,
@@ -112,11 +122,13 @@ class ReceiptDelegateAction:
 
     @classmethod
     def build(cls, data: dict) -> "ReceiptDelegateAction":
-        actions = [ReceiptAction.build(action) for action in data["actions"]]
-        del data["actions"]
         return cls(
-            actions=actions,
-            **data,
+            actions=[ReceiptAction.build(action) for action in data["actions"]],
+            sender_id=data["sender_id"],
+            receiver_id=data["receiver_id"],
+            public_key=data["public_key"],
+            nonce=data["nonce"],
+            max_block_height=data["max_block_height"],
         )
 
     @property
@@ -174,10 +186,10 @@ class DelegateActionModel:
 
     @staticmethod
     def bytes_to_json(data: bytes) -> dict:
-        return json.loads(DelegateAction.bytes_to_json(data))
+        return json_loads(DelegateAction.bytes_to_json(data))
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiptAction:
     transactions_type: ActionType
     # Transaction
@@ -202,7 +214,7 @@ class ReceiptAction:
         if isinstance(data, str) and data == "CreateAccount":
             return cls(transactions_type=ActionType.CREATE_ACCOUNT)
 
-        action_type, action_data = list(data.items())[0]
+        action_type, action_data = next(iter(data.items()))
         access_key = None
         args = ""
         if action_type == ActionType.ADD_KEY:
@@ -210,7 +222,7 @@ class ReceiptAction:
         elif action_type == ActionType.FUNCTION_CALL:
             try:
                 args = base64.b64decode(action_data["args"])
-                args = json.loads(args)
+                args = json_loads(args)
             except (UnicodeDecodeError, JSONDecodeError):
                 args = None
 
@@ -224,24 +236,37 @@ class ReceiptAction:
                 delegate_action=delegate_action,
             )
 
-        action_data.pop("args", None)
-        action_data.pop("access_key", None)
         return cls(
             transactions_type=action_type,
-            access_key=access_key,
+            deposit=action_data.get("deposit"),
+            gas=action_data.get("gas"),
+            method_name=action_data.get("method_name"),
             args=args,
-            **action_data,
+            beneficiary_id=action_data.get("beneficiary_id"),
+            public_key=action_data.get("public_key"),
+            access_key=access_key,
+            stake=action_data.get("stake"),
         )
 
 
 class TransactionData:
+    __slots__ = (
+        "hash",
+        "public_key",
+        "receiver_id",
+        "signature",
+        "signer_id",
+        "nonce",
+        "_actions_data",
+        "_actions",
+    )
+
     hash: str
     public_key: str
     receiver_id: str
     signature: str
     signer_id: str
     nonce: int
-    actions: List[ReceiptAction]
 
     def __init__(
         self,
@@ -254,7 +279,8 @@ class TransactionData:
         actions,
         **kargs,
     ):
-        self.actions = [ReceiptAction.build(a) for a in actions]
+        self._actions_data = actions
+        self._actions = None
         self.nonce = nonce
         self.signer_id = signer_id
         self.public_key = public_key
@@ -262,25 +288,64 @@ class TransactionData:
         self.signature = signature
         self.hash = hash
 
+    @property
+    def actions(self) -> List[ReceiptAction]:
+        if self._actions is None:
+            self._actions = [ReceiptAction.build(a) for a in self._actions_data]
+        return self._actions
+
     @property
     def url(self):
         return f"https://nearblocks.io/ru/txns/{self.hash}"
 
 
 class TransactionResult:
-    receipt_outcome: List[ReceiptOutcome]
-    transaction_outcome: ReceiptOutcome
+    """
+    Raw outcomes are parsed on first access, most callers only need the transaction hash
+    """
+
+    __slots__ = (
+        "status",
+        "_receipts_outcome_data",
+        "_receipt_outcome",
+        "_transaction_outcome_data",
+        "_transaction_outcome",
+        "_transaction_data",
+        "_transaction",
+    )
+
     status: dict
-    transaction: TransactionData
 
-    def __init__(self, receipts_outcome, transaction_outcome, transaction, status):
+    def __init__(
+        self, receipts_outcome, transaction_outcome, transaction, status, **kargs
+    ):
         self.status = status
-        self.transaction = TransactionData(**transaction)
-        self.transaction_outcome = ReceiptOutcome(transaction_outcome)
+        self._transaction_data = transaction
+        self._transaction = None
+        self._transaction_outcome_data = transaction_outcome
+        self._transaction_outcome = None
+        self._receipts_outcome_data = receipts_outcome
+        self._receipt_outcome = None
+
+    @property
+    def transaction(self) -> TransactionData:
+        if self._transaction is None:
+            self._transaction = TransactionData(**self._transaction_data)
+        return self._transaction
+
+    @property
+    def transaction_outcome(self) -> ReceiptOutcome:
+        if self._transaction_outcome is None:
+            self._transaction_outcome = ReceiptOutcome(self._transaction_outcome_data)
+        return self._transaction_outcome
 
-        self.receipt_outcome = []
-        for ro in receipts_outcome:
-            self.receipt_outcome.append(ReceiptOutcome(ro))
+    @property
+    def receipt_outcome(self) -> List[ReceiptOutcome]:
+        if self._receipt_outcome is None:
+            self._receipt_outcome = [
+                ReceiptOutcome(ro) for ro in self._receipts_outcome_data
+            ]
+        return self._receipt_outcome
 
     @property
     def logs(self):
@@ -303,7 +368,7 @@ class ViewFunctionResult:
         self.result = result
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessKey:
     permission_type: PublicKeyPermissionType
     nonce: int
@@ -318,7 +383,7 @@ class AccessKey:
                 nonce=data["nonce"], permission_type=PublicKeyPermissionType.FULL_ACCESS
             )
 
-        permission_type, permission_data = list(data["permission"].items())[0]
+        permission_type, permission_data = next(iter(data["permission"].items()))
         return cls(
             nonce=data["nonce"],
             permission_type=PublicKeyPermissionType.FUNCTION_CALL,
@@ -326,7 +391,7 @@ class AccessKey:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PublicKey:
     public_key: str
     access_key: AccessKey
@@ -339,7 +404,7 @@ class PublicKey:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountAccessKey:
     block_hash: str
     block_height: int
@@ -1,12 +1,11 @@
 import asyncio
 import base64
-import json
-from typing import Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 from aiohttp import ClientResponseError, ClientConnectorError, ServerDisconnectedError
 from loguru import logger
-import datetime
 from sdk.py_near import constants
 from sdk.py_near.constants import TIMEOUT_WAIT_RPC
 from sdk.py_near.exceptions.exceptions import RpcNotAvailableError
@@ -26,6 +25,7 @@ from sdk.py_near.exceptions.provider import (
     ERROR_CODE_TO_EXCEPTION,
 )
 from sdk.py_near.models import TransactionResult
+from sdk.py_near.utils import json_loads
 
 PROVIDER_CODE_TO_EXCEPTION = {
     "UNKNOWN_BLOCK": UnknownBlockError,
@@ -44,7 +44,7 @@ PROVIDER_CODE_TO_EXCEPTION = {
 
 
 class JsonProvider(object):
-    def __init__(self, rpc_addr):
+    def __init__(self, rpc_addr, allow_batch: bool = False):
         if isinstance(rpc_addr, tuple):
             self._rpc_addresses = ["http://{}:{}".format(*rpc_addr)]
         elif isinstance(rpc_addr, list):
@@ -52,69 +52,159 @@ class JsonProvider(object):
         else:
             self._rpc_addresses = [rpc_addr]
         self._available_rpcs = self._rpc_addresses.copy()
-        self._last_rpc_addr_check = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._check_task: Optional[asyncio.Task] = None
+        self._check_handle: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+        self._block_time = constants.BLOCK_TIME
+        self._last_block: Optional[Tuple[int, float]] = None
+        self._account_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+        self._allow_batch = allow_batch
+        self._no_batch_rpcs = set()
+        self._default_timeout = aiohttp.ClientTimeout(
+            total=TIMEOUT_WAIT_RPC,
+            connect=constants.RPC_CONNECT_TIMEOUT,
+            sock_read=TIMEOUT_WAIT_RPC,
+        )
+        self._status_timeout = aiohttp.ClientTimeout(
+            total=constants.RPC_STATUS_TIMEOUT,
+            connect=constants.RPC_CONNECT_TIMEOUT,
+        )
 
-    async def check_available_rpcs(self):
-        available_rpcs = []
-        for rpc_addr in self._rpc_addresses:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    timestamp_start = datetime.datetime.utcnow().timestamp()
-                    r = await session.get(
-                        "%s/status" % rpc_addr, timeout=TIMEOUT_WAIT_RPC
-                    )
-                    if r.status == 200:
-                        data = json.loads(await r.text())
-                        if not data["sync_info"]["syncing"]:
-                            available_rpcs.append(
-                                (
-                                    rpc_addr,
-                                    datetime.datetime.utcnow().timestamp()
-                                    - timestamp_start,
-                                )
-                            )
-                            continue
-                    if rpc_addr in self._available_rpcs:
-                        if r.status == 200:
-                            logger.error(f"Remove async RPC : {rpc_addr}")
-                        else:
-                            logger.error(
-                                f"Remove rpc because of error {r.status}: {rpc_addr}"
-                            )
-            except Exception as e:
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Shared keep-alive session, created lazily inside the running event loop
+        :return: aiohttp.ClientSession
+        """
+        if self._closed:
+            raise RpcNotAvailableError("JsonProvider is closed")
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100, limit_per_host=32, keepalive_timeout=60, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _client_timeout(self, timeout) -> aiohttp.ClientTimeout:
+        if isinstance(timeout, aiohttp.ClientTimeout):
+            return timeout
+        if timeout == TIMEOUT_WAIT_RPC:
+            return self._default_timeout
+        return aiohttp.ClientTimeout(
+            total=timeout, connect=constants.RPC_CONNECT_TIMEOUT, sock_read=timeout
+        )
+
+    async def close(self):
+        """
+        Stop background RPC checks and close the shared session, call it on shutdown
+        :return:
+        """
+        self._closed = True
+        self._cancel_rpc_check_timer()
+        if self._check_task is not None and not self._check_task.done():
+            self._check_task.cancel()
+        self._check_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _cancel_rpc_check_timer(self):
+        if self._check_handle is not None:
+            self._check_handle.cancel()
+            self._check_handle = None
+
+    def _schedule_rpc_check(self):
+        if self._closed:
+            return
+        if self._check_task is None or self._check_task.done():
+            # a check started early replaces the pending periodic one
+            self._cancel_rpc_check_timer()
+            self._check_task = asyncio.ensure_future(self._run_rpc_check())
+
+    async def _run_rpc_check(self):
+        try:
+            await self.check_available_rpcs()
+        except Exception as e:
+            logger.exception(e)
+        if self._closed:
+            return
+        self._cancel_rpc_check_timer()
+        self._check_handle = asyncio.get_running_loop().call_later(
+            constants.RPC_CHECK_INTERVAL, self._schedule_rpc_check
+        )
+
+    async def _probe_rpc(self, rpc_addr) -> Optional[float]:
+        """
+        Check that RPC is reachable and synced
+        :param rpc_addr:
+        :return: response time or None if RPC is not available
+        """
+        try:
+            timestamp_start = time.monotonic()
+            async with self.session.get(
+                "%s/status" % rpc_addr, timeout=self._status_timeout
+            ) as r:
+                if r.status == 200:
+                    data = json_loads(await r.read())
+                    if not data["sync_info"]["syncing"]:
+                        return time.monotonic() - timestamp_start
                 if rpc_addr in self._available_rpcs:
-                    logger.error(f"Remove rpc: {e}")
+                    if r.status == 200:
+                        logger.error(f"Remove async RPC : {rpc_addr}")
+                    else:
+                        logger.error(
+                            f"Remove rpc because of error {r.status}: {rpc_addr}"
+                        )
+        except Exception as e:
+            if rpc_addr in self._available_rpcs:
+                logger.error(f"Remove rpc: {e}")
+        return None
+
+    async def check_available_rpcs(self):
+        latencies = await asyncio.gather(
+            *[self._probe_rpc(rpc_addr) for rpc_addr in self._rpc_addresses]
+        )
+        available_rpcs = [
+            (rpc_addr, latency)
+            for rpc_addr, latency in zip(self._rpc_addresses, latencies)
+            if latency is not None
+        ]
         self._available_rpcs = [
             r[0] for r in sorted(available_rpcs, key=lambda x: x[1])
         ]
 
-    async def call_rpc_request(self, method, params, timeout=TIMEOUT_WAIT_RPC):
-        if (
-            self._last_rpc_addr_check < datetime.datetime.now().timestamp() - 30
-            or not self._available_rpcs
-        ):
-            self._last_rpc_addr_check = datetime.datetime.now().timestamp()
-            if self._available_rpcs:
-                asyncio.create_task(self.check_available_rpcs())
-            else:
-                logger.warning("No RPC available, rechecking")
-                await self.check_available_rpcs()
+    async def refresh_available_rpcs(self):
+        """
+        Make sure the background RPC check is running and fail fast if no RPC is available
+        :return:
+        """
+        if self._check_task is None:
+            self._schedule_rpc_check()
 
         if not self._available_rpcs:
+            logger.warning("No RPC available, rechecking")
+            self._schedule_rpc_check()
             raise RpcNotAvailableError("No RPC available")
 
+    async def call_rpc_request(self, method, params, timeout=TIMEOUT_WAIT_RPC):
+        await self.refresh_available_rpcs()
+        timeout = self._client_timeout(timeout)
+
         j = {"method": method, "params": params, "id": "dontcare", "jsonrpc": "2.0"}
 
         content = None
         for rpc_addr in self._available_rpcs:
             try:
-                async with aiohttp.ClientSession() as session:
-                    r = await session.post(rpc_addr, json=j, timeout=timeout)
+                async with self.session.post(
+                    rpc_addr, json=j, timeout=timeout
+                ) as r:
                     r.raise_for_status()
-                    content = json.loads(await r.text())
+                    content = json_loads(await r.read())
                 break
             except (
                 RPCTimeoutError,
+                asyncio.TimeoutError,
                 ClientResponseError,
                 ClientConnectorError,
                 ServerDisconnectedError,
@@ -124,46 +214,161 @@ class JsonProvider(object):
                 continue
         return content
 
+    async def call_rpc_batch_request(
+        self, requests: List[Tuple[str, Any]], timeout=TIMEOUT_WAIT_RPC
+    ) -> Optional[List[dict]]:
+        """
+        Send JSON-RPC 2.0 batch to the first available RPC which accepts it
+        :param requests: list of (method, params)
+        :param timeout: rpc request timeout
+        :return: responses in order of requests or None if no RPC accepted the batch
+        """
+        await self.refresh_available_rpcs()
+        timeout = self._client_timeout(timeout)
+
+        j = [
+            {"method": method, "params": params, "id": i, "jsonrpc": "2.0"}
+            for i, (method, params) in enumerate(requests)
+        ]
+
+        for rpc_addr in self._available_rpcs:
+            if rpc_addr in self._no_batch_rpcs:
+                continue
+            try:
+                async with self.session.post(
+                    rpc_addr, json=j, timeout=timeout
+                ) as r:
+                    r.raise_for_status()
+                    content = json_loads(await r.read())
+            except ClientResponseError as e:
+                if e.status < 500:
+                    logger.warning(f"Batch requests are not supported: {rpc_addr}")
+                    self._no_batch_rpcs.add(rpc_addr)
+                else:
+                    logger.error(f"Rpc error: {e}")
+                continue
+            except (
+                RPCTimeoutError,
+                asyncio.TimeoutError,
+                ClientConnectorError,
+                ServerDisconnectedError,
+                ConnectionError,
+            ) as e:
+                logger.error(f"Rpc error: {e}")
+                continue
+
+            # responses may come in any order, match them by id
+            if isinstance(content, list):
+                by_id = {c.get("id"): c for c in content if isinstance(c, dict)}
+                if len(by_id) == len(j) and all(i in by_id for i in range(len(j))):
+                    return [by_id[i] for i in range(len(j))]
+            logger.warning(f"Batch requests are not supported: {rpc_addr}")
+            self._no_batch_rpcs.add(rpc_addr)
+        return None
+
     @staticmethod
     def get_error_from_response(content: dict):
-        if "error" in content:
-            error_code = content["error"].get("cause", {}).get("name", "")
-            body = content["error"]["data"]
-            error = PROVIDER_CODE_TO_EXCEPTION.get(error_code, InternalError)(
-                body, error_json=content["error"]
-            )
-            while True:
-                if not isinstance(body, dict):
-                    break
-                if not body:
-                    return error
-                key, body = list(body.items())[0]
-                if key in ERROR_CODE_TO_EXCEPTION:
-                    error = ERROR_CODE_TO_EXCEPTION[key](
-                        body, error_json=content["error"]
-                    )
-                else:
-                    break
-            return error
+        error_json = content.get("error")
+        if error_json is None:
+            return None
+        cause = error_json.get("cause")
+        error_code = cause.get("name", "") if cause else ""
+        body = error_json["data"]
+        error = (PROVIDER_CODE_TO_EXCEPTION.get(error_code) or InternalError)(
+            body, error_json=error_json
+        )
+        # walk nested {"Kind": {...}} and keep the most specific known error
+        while isinstance(body, dict) and body:
+            key, body = next(iter(body.items()))
+            exception = ERROR_CODE_TO_EXCEPTION.get(key)
+            if exception is None:
+                break
+            error = exception(body, error_json=error_json)
+        return error
 
     async def json_rpc(self, method, params, timeout=TIMEOUT_WAIT_RPC):
         content = await self.call_rpc_request(method, params, timeout)
         if not content:
             raise RpcNotAvailableError("RPC not available")
 
-        error = self.get_error_from_response(content)
-        if error:
-            raise error
-        return content["result"]
+        if "error" not in content:
+            return content["result"]
+        raise self.get_error_from_response(content)
 
-    async def send_tx(self, signed_tx: str, timeout: int = constants.TIMEOUT_WAIT_RPC):
+    async def json_rpc_batch(
+        self, requests: List[Tuple[str, Any]], timeout=TIMEOUT_WAIT_RPC
+    ) -> list:
+        """
+        Call several methods in one HTTP round-trip. Falls back to concurrent
+        single requests if batching is disabled or not supported by the RPC
+        :param requests: list of (method, params)
+        :param timeout: rpc request timeout
+        :return: list of results in order of requests
+        """
+        contents = None
+        if self._allow_batch:
+            contents = await self.call_rpc_batch_request(requests, timeout)
+        if contents is None:
+            return list(
+                await asyncio.gather(
+                    *[
+                        self.json_rpc(method, params, timeout)
+                        for method, params in requests
+                    ]
+                )
+            )
+
+        results = []
+        for content in contents:
+            if "error" in content:
+                raise self.get_error_from_response(content)
+            results.append(content["result"])
+        return results
+
+    def invalidate_account_cache(self, account_id: str):
+        """
+        Drop cached view_account results for account_id
+        :param account_id:
+        :return:
+        """
+        for key in [k for k in self._account_cache if k[0] == account_id]:
+            del self._account_cache[key]
+
+    def _observe_block_height(self, block_height: int):
+        """
+        Track average block time from block heights seen in status responses
+        :param block_height:
+        :return:
+        """
+        now = time.monotonic()
+        if self._last_block is not None:
+            last_height, last_ts = self._last_block
+            if block_height <= last_height:
+                return
+            sample = (now - last_ts) / (block_height - last_height)
+            self._block_time = 0.8 * self._block_time + 0.2 * sample
+        self._last_block = (block_height, now)
+
+    async def send_tx(
+        self,
+        signed_tx: str,
+        timeout: int = constants.TIMEOUT_WAIT_RPC,
+        signer_id: Optional[str] = None,
+    ):
         """
         Send a signed transaction to the network and return the hash of the transaction
         :param signed_tx: base64 encoded signed transaction, str.
         :param timeout: rpc request timeout
+        :param signer_id: if set, cached account state of the signer is invalidated
         :return:
         """
-        return await self.json_rpc("broadcast_tx_async", [signed_tx], timeout=timeout)
+        try:
+            return await self.json_rpc(
+                "broadcast_tx_async", [signed_tx], timeout=timeout
+            )
+        finally:
+            if signer_id:
+                self.invalidate_account_cache(signer_id)
 
     async def send_tx_and_wait(
         self,
@@ -171,45 +376,61 @@ class JsonProvider(object):
         timeout: int = constants.TIMEOUT_WAIT_RPC,
         trx_hash: Optional[str] = None,
         receiver_id: Optional[str] = None,
+        signer_id: Optional[str] = None,
     ):
         """
         Send a signed transaction to the network and wait for it to be included in a block
         :param signed_tx: base64 encoded signed transaction, str
         :param timeout: rpc request timeout
+        :param signer_id: if set, cached account state of the signer is invalidated
         :return:
         """
+        # invalidate after the send, so state read while waiting is not kept
         try:
-            return await self.json_rpc(
-                "broadcast_tx_commit",
-                [signed_tx],
-                timeout=timeout,
-            )
-        except RPCTimeoutError:
-            if receiver_id and trx_hash:
-                for _ in range(constants.TIMEOUT_WAIT_RPC // 3):
-                    await asyncio.sleep(3)
-                    try:
-                        result = await self.get_tx(trx_hash, receiver_id)
-                    except InternalError:
-                        continue
-                    except Exception as e:
-                        # logger.exception(e)
-                        continue
-                    if result:
-                        return result
-            raise
+            try:
+                return await self.json_rpc(
+                    "broadcast_tx_commit",
+                    [signed_tx],
+                    timeout=timeout,
+                )
+            except RPCTimeoutError:
+                if receiver_id and trx_hash:
+                    # the commit timeout took longer than a block, so poll right away,
+                    # then back off from the observed block time
+                    delay = constants.TX_POLL_MIN_DELAY
+                    next_delay = self._block_time
+                    deadline = time.monotonic() + constants.TIMEOUT_WAIT_RPC
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(delay)
+                        delay = next_delay
+                        next_delay = min(next_delay * 1.5, constants.TX_POLL_MAX_DELAY)
+                        try:
+                            result = await self.get_tx(trx_hash, receiver_id)
+                        except InternalError:
+                            continue
+                        except Exception as e:
+                            # logger.exception(e)
+                            continue
+                        if result:
+                            return result
+                raise
+        finally:
+            if signer_id:
+                self.invalidate_account_cache(signer_id)
 
     async def get_status(self):
 
         for rpc_addr in self._available_rpcs:
             try:
-                async with aiohttp.ClientSession() as session:
-                    r = await session.get(
-                        "%s/status" % rpc_addr, timeout=TIMEOUT_WAIT_RPC
-                    )
+                async with self.session.get(
+                    "%s/status" % rpc_addr, timeout=self._status_timeout
+                ) as r:
                     if r.status == 200:
-                        data = json.loads(await r.text())
+                        data = json_loads(await r.read())
                         if not data["sync_info"]["syncing"]:
+                            self._observe_block_height(
+                                data["sync_info"]["latest_block_height"]
+                            )
                             return data
             except (
                 ClientResponseError,
@@ -230,7 +451,11 @@ class JsonProvider(object):
         return await self.json_rpc("query", query_object)
 
     async def get_account(self, account_id, finality="optimistic"):
-        return await self.json_rpc(
+        key = (account_id, finality)
+        cached = self._account_cache.get(key)
+        if cached and time.monotonic() - cached[0] < constants.ACCOUNT_CACHE_TTL:
+            return cached[1]
+        result = await self.json_rpc(
             "query",
             {
                 "request_type": "view_account",
@@ -238,6 +463,35 @@ class JsonProvider(object):
                 "finality": finality,
             },
         )
+        self._account_cache[key] = (time.monotonic(), result)
+        return result
+
+    async def get_access_key_and_status(
+        self, account_id, public_key, finality="optimistic"
+    ):
+        """
+        Fetch view_access_key and node status in a single batch
+        :param account_id:
+        :param public_key:
+        :param finality:
+        :return: (access_key, status)
+        """
+        access_key, status = await self.json_rpc_batch(
+            [
+                (
+                    "query",
+                    {
+                        "request_type": "view_access_key",
+                        "account_id": account_id,
+                        "public_key": public_key,
+                        "finality": finality,
+                    },
+                ),
+                ("status", []),
+            ]
+        )
+        self._observe_block_height(status["sync_info"]["latest_block_height"])
+        return access_key, status
 
     async def get_access_key_list(self, account_id, finality="optimistic"):
         return await self.json_rpc(
@@ -274,12 +528,25 @@ class JsonProvider(object):
         args,
         finality="optimistic",
         block_id: Optional[int] = None,
+        args_base64: Optional[str] = None,
     ):
+        """
+        Call view function on smart contract
+        :param account_id:
+        :param method_name:
+        :param args: serialized json args, bytes
+        :param finality:
+        :param block_id:
+        :param args_base64: precomputed base64 of args, if set args is ignored
+        :return:
+        """
+        if args_base64 is None:
+            args_base64 = base64.b64encode(args).decode("utf8")
         body = {
             "request_type": "call_function",
             "account_id": account_id,
             "method_name": method_name,
-            "args_base64": base64.b64encode(args).decode("utf8"),
+            "args_base64": args_base64,
         }
         if block_id:
             body["block_id"] = block_id
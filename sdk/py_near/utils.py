@@ -1,5 +1,10 @@
 from datetime import datetime
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 def utcnow():
     return datetime.utcnow()